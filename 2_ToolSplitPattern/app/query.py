@@ -12,15 +12,19 @@ import sys
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
 
 API_URL = os.environ.get("API_URL", "http://api:8080")
 JOB_ID  = os.environ.get("JOB_ID",  "").strip()
 
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 def wait_for_service(retries: int = 10, delay: float = 1.0) -> bool:
     for i in range(retries):
         try:
-            r = requests.get(f"{API_URL}/health", timeout=2)
+            r = SESSION.get(f"{API_URL}/health", timeout=2)
             if r.ok:
                 return True
         except Exception:
@@ -38,7 +42,7 @@ def main() -> int:
 
     if JOB_ID:
         print(f"[query] Fetching job {JOB_ID}", flush=True)
-        r = requests.get(f"{API_URL}/jobs/{JOB_ID}", timeout=5)
+        r = SESSION.get(f"{API_URL}/jobs/{JOB_ID}", timeout=5)
         if r.status_code == 404:
             print(f"[query] Job {JOB_ID!r} not found", flush=True)
             return 1
@@ -46,7 +50,7 @@ def main() -> int:
         print(json.dumps(r.json(), indent=2), flush=True)
     else:
         print("[query] Listing all jobs", flush=True)
-        r = requests.get(f"{API_URL}/jobs", timeout=5)
+        r = SESSION.get(f"{API_URL}/jobs", timeout=5)
         r.raise_for_status()
         data = r.json()
         print(f"[query] Total jobs: {data['count']}", flush=True)
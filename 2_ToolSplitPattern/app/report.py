@@ -6,24 +6,61 @@ Demonstrates that tool containers can access shared state independently
 of the service API, operating on the same persistent workspace volume.
 """
 
-import json
 import os
 import sys
 from collections import Counter
+from itertools import islice
 from pathlib import Path
 
+import orjson
+
 WORKSPACE  = Path(os.environ.get("WORKSPACE", "/workspace"))
 JOBS_FILE  = WORKSPACE / "jobs.json"
+JOBS_WAL   = WORKSPACE / "jobs.wal"
+
+
+LOAD_ATTEMPTS = 5
+
+
+def _snapshot_id():
+    """Identify the current jobs.json; the service replaces it on every snapshot."""
+    try:
+        st = JOBS_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def load_jobs() -> dict:
+    """Load the jobs.json snapshot and replay the service's jobs.wal over it.
+
+    The service may snapshot between the two reads (replacing jobs.json, then
+    truncating the WAL), which would leave an old snapshot with an empty WAL;
+    if jobs.json changed while we read, load again.
+    """
+    for _ in range(LOAD_ATTEMPTS):
+        before = _snapshot_id()
+        jobs = orjson.loads(JOBS_FILE.read_bytes()) if before else {}
+        wal = JOBS_WAL.read_bytes() if JOBS_WAL.exists() else b""
+        if _snapshot_id() == before:
+            break
+    for line in wal.splitlines():
+        try:
+            job = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            break
+        jobs[job["id"]] = job
+    return jobs
 
 
 def main() -> int:
     print(f"[report] Workspace: {WORKSPACE}", flush=True)
 
-    if not JOBS_FILE.exists():
+    if not JOBS_FILE.exists() and not JOBS_WAL.exists():
         print("[report] No jobs.json found — run 'make submit' first.", flush=True)
         return 0
 
-    jobs = json.loads(JOBS_FILE.read_text())
+    jobs = load_jobs()
 
     width = 54
     print("=" * width)
@@ -37,7 +74,8 @@ def main() -> int:
 
     print()
     print("  Recent jobs (up to 10):")
-    for job in list(jobs.values())[-10:]:
+    recent = list(islice(reversed(jobs.values()), 10))[::-1]
+    for job in recent:
         submitted = (job.get("submitted_at") or "?")[:19]
         print(f"  [{job['id']}] {job['name']:<20s} {job['status']:<10s} {submitted}")
 
@@ -4,9 +4,13 @@ Job Tracker Service — long-running daemon.
 
 Owns the job registry, persists state to the shared workspace volume,
 and exposes an HTTP API consumed by the tool containers.
+
+Every mutation appends the changed job to jobs.wal (one line, O(1));
+jobs.json is rewritten as a full snapshot at most once per SNAPSHOT_DELAY
+and the WAL truncated afterwards. Readers get the current state by
+loading jobs.json and replaying jobs.wal over it.
 """
 
-import json
 import os
 import threading
 import time
@@ -14,36 +18,97 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 
+import orjson
 from flask import Flask, jsonify, request
 
+from json_provider import OrjsonProvider
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 WORKSPACE = Path(os.environ.get("WORKSPACE", "/workspace"))
 JOBS_FILE = WORKSPACE / "jobs.json"
+JOBS_WAL  = WORKSPACE / "jobs.wal"
+SNAPSHOT_DELAY = 1.0   # seconds; mutations within this window share one snapshot
 _lock = threading.Lock()
+_jobs: dict | None = None   # in-memory registry, loaded once and written through
+_jobs_body: bytes | None = None   # cached GET /jobs response, dropped on every mutation
+_wal_fd: int | None = None   # O_APPEND descriptor for jobs.wal
+_snapshot_pending = False
 
 
 def load_jobs() -> dict:
+    """Load the jobs.json snapshot and replay jobs.wal over it."""
     WORKSPACE.mkdir(parents=True, exist_ok=True)
-    if JOBS_FILE.exists():
-        return json.loads(JOBS_FILE.read_text())
-    return {}
+    jobs = orjson.loads(JOBS_FILE.read_bytes()) if JOBS_FILE.exists() else {}
+    if JOBS_WAL.exists():
+        for line in JOBS_WAL.read_bytes().splitlines():
+            try:
+                job = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                break   # torn final write
+            jobs[job["id"]] = job
+    return jobs
 
 
 def save_jobs(jobs: dict) -> None:
+    """Atomically replace jobs.json: write + fsync a temp file, then rename over."""
     WORKSPACE.mkdir(parents=True, exist_ok=True)
-    JOBS_FILE.write_text(json.dumps(jobs, indent=2))
+    data = orjson.dumps(jobs, option=orjson.OPT_INDENT_2)
+    tmp = f"{JOBS_FILE}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, JOBS_FILE)
+
+
+def _ensure_loaded() -> dict:
+    """Return the cached registry, loading jobs.json on first use (caller holds _lock)."""
+    global _jobs, _wal_fd
+    if _jobs is None:
+        _jobs = load_jobs()
+        _wal_fd = os.open(JOBS_WAL, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        if os.fstat(_wal_fd).st_size:
+            # leftovers from an unclean stop: fold them into a fresh snapshot
+            save_jobs(_jobs)
+            os.ftruncate(_wal_fd, 0)
+    return _jobs
+
+
+def _record(job: dict) -> None:
+    """Append one job to the WAL and schedule a snapshot (caller holds _lock)."""
+    global _snapshot_pending
+    os.write(_wal_fd, orjson.dumps(job) + b"\n")
+    if not _snapshot_pending:
+        _snapshot_pending = True
+        timer = threading.Timer(SNAPSHOT_DELAY, _snapshot)
+        timer.daemon = True
+        timer.start()
+
+
+def _snapshot() -> None:
+    """Rewrite jobs.json from memory, then truncate the WAL it now covers."""
+    global _snapshot_pending
+    with _lock:
+        save_jobs(_jobs)
+        os.ftruncate(_wal_fd, 0)
+        _snapshot_pending = False
 
 
 def _process_job(job_id: str) -> None:
     """Simulate async job processing (completes after 1 s)."""
+    global _jobs_body
     time.sleep(1)
     with _lock:
-        jobs = load_jobs()
+        jobs = _ensure_loaded()
         if job_id in jobs:
             jobs[job_id]["status"] = "completed"
             jobs[job_id]["completed_at"] = datetime.utcnow().isoformat() + "Z"
-            save_jobs(jobs)
+            _record(jobs[job_id])
+            _jobs_body = None
 
 
 # ── Routes ─────────────────────────────────────────────────────────────────────
@@ -55,13 +120,18 @@ def health():
 
 @app.route("/jobs", methods=["GET"])
 def list_jobs():
+    global _jobs_body
     with _lock:
-        jobs = load_jobs()
-    return jsonify({"jobs": list(jobs.values()), "count": len(jobs)})
+        if _jobs_body is None:
+            jobs = _ensure_loaded()
+            _jobs_body = orjson.dumps({"jobs": list(jobs.values()), "count": len(jobs)})
+        body = _jobs_body
+    return app.response_class(body, mimetype="application/json")
 
 
 @app.route("/jobs", methods=["POST"])
 def submit_job():
+    global _jobs_body
     data = request.get_json(force=True) or {}
     job = {
         "id": str(uuid.uuid4())[:8],
@@ -72,9 +142,10 @@ def submit_job():
         "completed_at": None,
     }
     with _lock:
-        jobs = load_jobs()
+        jobs = _ensure_loaded()
         jobs[job["id"]] = job
-        save_jobs(jobs)
+        _record(job)
+        _jobs_body = None
 
     threading.Thread(target=_process_job, args=(job["id"],), daemon=True).start()
     return jsonify(job), 201
@@ -83,8 +154,7 @@ def submit_job():
 @app.route("/jobs/<job_id>", methods=["GET"])
 def get_job(job_id: str):
     with _lock:
-        jobs = load_jobs()
-    job = jobs.get(job_id)
+        job = _ensure_loaded().get(job_id)
     if not job:
         return jsonify({"error": f"Job {job_id!r} not found"}), 404
     return jsonify(job)
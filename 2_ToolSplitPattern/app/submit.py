@@ -12,16 +12,20 @@ import sys
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
 
 API_URL  = os.environ.get("API_URL",  "http://api:8080")
 JOB_NAME = os.environ.get("JOB_NAME", "demo-job")
 JOB_CMD  = os.environ.get("JOB_CMD",  "echo hello world")
 
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 def wait_for_service(retries: int = 10, delay: float = 1.0) -> bool:
     for i in range(retries):
         try:
-            r = requests.get(f"{API_URL}/health", timeout=2)
+            r = SESSION.get(f"{API_URL}/health", timeout=2)
             if r.ok:
                 return True
         except Exception:
@@ -40,7 +44,7 @@ def main() -> int:
     payload = {"name": JOB_NAME, "cmd": JOB_CMD}
     print(f"[submit] Submitting: {payload}", flush=True)
 
-    r = requests.post(f"{API_URL}/jobs", json=payload, timeout=5)
+    r = SESSION.post(f"{API_URL}/jobs", json=payload, timeout=5)
     r.raise_for_status()
 
     job = r.json()
@@ -4,11 +4,14 @@ Computes word-frequency statistics and persists results
 as JSON to the shared data volume.
 """
 import os
-import json
 from collections import Counter
+import orjson
 from flask import Flask, request, jsonify
 
+from json_provider import OrjsonProvider
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 DATA_DIR = os.environ.get("DATA_DIR", "/data")
 
@@ -24,19 +27,21 @@ def analyze():
     job_id = body.get("job_id", "")
     words  = body.get("words", [])
 
-    freq = Counter(words)
+    # Counter and sum(map(len, ...)) both iterate in C — no Python-level loop
+    freq  = Counter(words)
+    total = len(words)
     result = {
         "job_id":        job_id,
-        "total_words":   len(words),
+        "total_words":   total,
         "unique_words":  len(freq),
         "top_words":     freq.most_common(5),
-        "avg_word_len":  round(sum(len(w) for w in words) / len(words), 2) if words else 0,
+        "avg_word_len":  round(sum(map(len, words)) / total, 2) if total else 0,
     }
 
     os.makedirs(DATA_DIR, exist_ok=True)
     out_path = os.path.join(DATA_DIR, f"{job_id}.json")
-    with open(out_path, "w") as fh:
-        json.dump(result, fh, indent=2)
+    with open(out_path, "wb") as fh:
+        fh.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
 
     return jsonify({"job_id": job_id, "status": "stored"})
 
@@ -4,15 +4,22 @@ Routes POST /submit to the ingest service.
 Serves GET /result/<job_id> from the shared data volume.
 """
 import os
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from flask import Flask, request, jsonify
 
+from json_provider import OrjsonProvider
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 INGEST_URL = os.environ.get("INGEST_URL", "http://ingest:5001")
 DATA_DIR   = os.environ.get("DATA_DIR", "/data")
 
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 @app.route("/health")
 def health():
@@ -27,13 +34,13 @@ def submit():
         return jsonify({"error": "text is required"}), 400
 
     try:
-        resp = requests.post(f"{INGEST_URL}/ingest",
-                             json={"text": text}, timeout=10)
+        resp = SESSION.post(f"{INGEST_URL}/ingest",
+                            json={"text": text}, timeout=10)
         resp.raise_for_status()
     except requests.RequestException as exc:
         return jsonify({"error": f"ingest unavailable: {exc}"}), 502
 
-    return jsonify(resp.json()), 202
+    return jsonify(orjson.loads(resp.content)), 202
 
 
 @app.route("/result/<job_id>")
@@ -41,8 +48,8 @@ def result(job_id):
     path = os.path.join(DATA_DIR, f"{job_id}.json")
     if not os.path.isfile(path):
         return jsonify({"error": "not found", "job_id": job_id}), 404
-    with open(path) as fh:
-        return jsonify(json.load(fh))
+    with open(path, "rb") as fh:
+        return jsonify(orjson.loads(fh.read()))
 
 
 if __name__ == "__main__":
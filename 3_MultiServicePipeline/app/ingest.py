@@ -5,12 +5,19 @@ Assigns a UUID job_id to each submission and forwards to normalize.
 import os
 import uuid
 import requests
+from requests.adapters import HTTPAdapter
 from flask import Flask, request, jsonify
 
+from json_provider import OrjsonProvider
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 NORMALIZE_URL = os.environ.get("NORMALIZE_URL", "http://normalize:5002")
 
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 @app.route("/health")
 def health():
@@ -24,8 +31,8 @@ def ingest():
     job_id = str(uuid.uuid4())
 
     try:
-        resp = requests.post(f"{NORMALIZE_URL}/normalize",
-                             json={"job_id": job_id, "text": text}, timeout=10)
+        resp = SESSION.post(f"{NORMALIZE_URL}/normalize",
+                            json={"job_id": job_id, "text": text}, timeout=10)
         resp.raise_for_status()
     except requests.RequestException as exc:
         return jsonify({"error": f"normalize unavailable: {exc}"}), 502
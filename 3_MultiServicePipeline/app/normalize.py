@@ -6,12 +6,21 @@ then forwards the token list to the analyze service.
 import os
 import re
 import requests
+from requests.adapters import HTTPAdapter
 from flask import Flask, request, jsonify
 
+from json_provider import OrjsonProvider
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 ANALYZE_URL = os.environ.get("ANALYZE_URL", "http://analyze:5003")
 
+_STRIP_RE = re.compile(r"[^a-z0-9\s]")
+
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 @app.route("/health")
 def health():
@@ -24,12 +33,11 @@ def normalize():
     job_id = body.get("job_id", "")
     text   = body.get("text", "")
 
-    clean = re.sub(r"[^a-z0-9\s]", "", text.lower())
-    words = [w for w in clean.split() if w]
+    words = _STRIP_RE.sub("", text.lower()).split()
 
     try:
-        resp = requests.post(f"{ANALYZE_URL}/analyze",
-                             json={"job_id": job_id, "words": words}, timeout=10)
+        resp = SESSION.post(f"{ANALYZE_URL}/analyze",
+                            json={"job_id": job_id, "words": words}, timeout=10)
         resp.raise_for_status()
     except requests.RequestException as exc:
         return jsonify({"error": f"analyze unavailable: {exc}"}), 502
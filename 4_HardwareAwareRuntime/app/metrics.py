@@ -6,16 +6,38 @@ Endpoints:
   GET /health           → {"status": "ok"}
   GET /latest           → most recent sensor reading
   GET /history?n=<N>    → last N readings (default 20)
-  GET /stats            → min/max/avg over last 100 readings
+  GET /stats            → min/max/avg over last 100 readings (pre-aggregated by
+                          the sensor into /data/stats.json)
 """
 
 import json
 import os
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 LATEST_PATH = "/data/latest.json"
 HISTORY_PATH = "/data/history.jsonl"
+STATS_PATH = "/data/stats.json"
 PORT = 8080  # fixed internal container port; host binding is set by METRICS_PORT in compose
+TAIL_LINE_BYTES = 512  # generous per-line estimate used to size the tail window
+
+
+def read_tail(path: str, n: int) -> list[bytes]:
+    """Return the last n non-empty lines of path, reading only the end of the file."""
+    if n <= 0:
+        return []
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        window = n * TAIL_LINE_BYTES
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            lines = f.read().splitlines()
+            if start > 0:
+                lines = lines[1:]  # first line is (probably) cut in half
+            lines = [l for l in lines if l.strip()]
+            if len(lines) >= n or start == 0:
+                return lines[-n:]
+            window *= 2
 
 
 class MetricsHandler(BaseHTTPRequestHandler):
@@ -23,7 +45,9 @@ class MetricsHandler(BaseHTTPRequestHandler):
         pass
 
     def send_json(self, code: int, data: dict):
-        body = json.dumps(data, indent=2).encode()
+        self.send_body(code, json.dumps(data, indent=2).encode())
+
+    def send_body(self, code: int, body: bytes):
         self.send_response(code)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
@@ -54,37 +78,22 @@ class MetricsHandler(BaseHTTPRequestHandler):
                         except ValueError:
                             pass
             try:
-                with open(HISTORY_PATH) as f:
-                    lines = f.readlines()
-                readings = [json.loads(l) for l in lines[-n:] if l.strip()]
+                # one decoder call over a synthesized array instead of one per line
+                readings = json.loads(b"[" + b",".join(read_tail(HISTORY_PATH, n)) + b"]")
                 self.send_json(200, {"count": len(readings), "readings": readings})
             except FileNotFoundError:
                 self.send_json(200, {"count": 0, "readings": []})
 
         elif path == "/stats":
+            # stats.json is already pretty-printed JSON; serve the bytes as-is
             try:
-                with open(HISTORY_PATH) as f:
-                    lines = f.readlines()
-                readings = [json.loads(l) for l in lines[-100:] if l.strip()]
-                if not readings:
-                    self.send_json(200, {"error": "no data"})
-                    return
-
-                def agg(vals):
-                    return {
-                        "min": round(min(vals), 2),
-                        "max": round(max(vals), 2),
-                        "avg": round(sum(vals) / len(vals), 2),
-                    }
-
-                self.send_json(200, {
-                    "samples": len(readings),
-                    "source": readings[-1].get("source", "unknown"),
-                    "temp_c": agg([r["temp_c"] for r in readings]),
-                    "pressure_hpa": agg([r["pressure_hpa"] for r in readings]),
-                    "humidity_pct": agg([r["humidity_pct"] for r in readings]),
-                })
+                with open(STATS_PATH, "rb") as f:
+                    body = f.read()
             except FileNotFoundError:
+                body = b""
+            if body:
+                self.send_body(200, body)
+            else:
                 self.send_json(200, {"error": "no data"})
 
         else:
@@ -93,7 +102,7 @@ class MetricsHandler(BaseHTTPRequestHandler):
 
 def main():
     print(f"[metrics] Listening on http://0.0.0.0:{PORT}", flush=True)
-    server = HTTPServer(("0.0.0.0", PORT), MetricsHandler)
+    server = ThreadingHTTPServer(("0.0.0.0", PORT), MetricsHandler)
     server.serve_forever()
 
 
@@ -12,13 +12,18 @@ Sensor reader — runs in both sim and hw modes.
     match the device's binary protocol.
 
 Writes:
-  /data/latest.json  — most recent reading (atomic rename)
-  /data/history.jsonl — append-only log (trimmed to MAX_HISTORY lines)
+  /data/latest.json  — most recent reading (fsync + atomic rename)
+  /data/history.jsonl — append-only log; the last MAX_HISTORY lines are mirrored
+                        in memory and written back as a compacted file once the
+                        log grows TRIM_SLACK lines past the limit
+  /data/stats.json   — min/max/avg over the last STATS_WINDOW readings,
+                        refreshed on every sample so /stats is a plain read
 """
 
 import json
 import os
 import time
+from collections import deque
 
 SENSOR_SOURCE = os.getenv("SENSOR_SOURCE", "sim")
 SENSOR_FILE = "/data/sensor.dat"
@@ -26,7 +31,15 @@ DEVICE_PATH = "/dev/hwsensor"
 INTERVAL = float(os.getenv("SAMPLE_INTERVAL", "1"))
 LATEST_PATH = "/data/latest.json"
 HISTORY_PATH = "/data/history.jsonl"
+STATS_PATH = "/data/stats.json"
+STATS_WINDOW = 100
 MAX_HISTORY = 1000
+TRIM_SLACK = 100
+
+_history_lines: int | None = None  # lines in history.jsonl, counted once then tracked
+_history: deque = deque(maxlen=MAX_HISTORY)  # last MAX_HISTORY lines of history.jsonl
+_window: deque = deque(maxlen=STATS_WINDOW)  # most recent readings, feeds stats.json
+_history_fd: int | None = None  # long-lived O_APPEND descriptor for history.jsonl
 
 
 def read_from_file() -> dict | None:
@@ -62,26 +75,81 @@ def read_from_device() -> dict | None:
         return None
 
 
-def save_reading(reading: dict):
-    line = json.dumps(reading)
+def atomic_write(path: str, data: bytes):
+    """Write data to path.tmp, fsync it, then rename over path."""
+    tmp = path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
+def append_history(line: bytes):
+    """Append one line with a single write() on a descriptor kept open between samples."""
+    global _history_fd
+    if _history_fd is None:
+        _history_fd = os.open(HISTORY_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    os.write(_history_fd, line)
 
-    # Atomic write of latest.json
-    tmp = LATEST_PATH + ".tmp"
-    with open(tmp, "w") as f:
-        f.write(line + "\n")
-    os.replace(tmp, LATEST_PATH)
 
-    # Append to history
-    with open(HISTORY_PATH, "a") as f:
-        f.write(line + "\n")
+def compute_stats() -> dict:
+    def agg(vals):
+        return {
+            "min": round(min(vals), 2),
+            "max": round(max(vals), 2),
+            "avg": round(sum(vals) / len(vals), 2),
+        }
+
+    return {
+        "samples": len(_window),
+        "source": _window[-1].get("source", "unknown"),
+        "temp_c": agg([r["temp_c"] for r in _window]),
+        "pressure_hpa": agg([r["pressure_hpa"] for r in _window]),
+        "humidity_pct": agg([r["humidity_pct"] for r in _window]),
+    }
 
-    # Trim history if it grows too large
+
+def save_reading(reading: dict):
+    global _history_lines, _history_fd
+    line = (json.dumps(reading) + "\n").encode()
+
+    atomic_write(LATEST_PATH, line)
+
+    append_history(line)
+
+    # First sample since start: read the file once to learn the line count
+    # and seed the history mirror and stats window; afterwards all three are
+    # tracked in memory
+    if _history_lines is None:
+        with open(HISTORY_PATH, "rb") as f:
+            lines = f.read().splitlines()
+        _history_lines = len(lines)
+        _history.extend(l + b"\n" for l in lines[-MAX_HISTORY:] if l.strip())
+        for l in lines[-STATS_WINDOW:]:
+            try:
+                _window.append(json.loads(l))
+            except json.JSONDecodeError:
+                pass
+    else:
+        _history_lines += 1
+        _history.append(line)
+        _window.append(reading)
+
+    if _window:
+        atomic_write(STATS_PATH, json.dumps(compute_stats(), indent=2).encode())
+
+    # Compact in batches from the in-memory mirror: no re-read of the file,
+    # and only once it is TRIM_SLACK lines over the limit
     try:
-        with open(HISTORY_PATH) as f:
-            lines = f.readlines()
-        if len(lines) > MAX_HISTORY:
-            with open(HISTORY_PATH, "w") as f:
-                f.writelines(lines[-MAX_HISTORY:])
+        if _history_lines > MAX_HISTORY + TRIM_SLACK:
+            atomic_write(HISTORY_PATH, b"".join(_history))
+            _history_lines = len(_history)
+            # the rename replaced the inode; reopen on the next append
+            os.close(_history_fd)
+            _history_fd = None
     except Exception:
         pass
 
@@ -8,15 +8,22 @@ Environment-aware API — behaviour driven by APP_ENV.
 import os
 import time
 import json
+import threading
+from collections import Counter
+import orjson
 from flask import Flask, request, jsonify
 
+from json_provider import OrjsonProvider
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 APP_ENV   = os.environ.get("APP_ENV", "development")
 DATA_FILE = "/data/store.json"
 
 start_time     = time.time()
-request_counts = {}
+request_counts = Counter()
+_counts_lock   = threading.Lock()   # gunicorn runs handlers on several threads
 
 
 def log(msg):
@@ -38,14 +45,24 @@ def load_store():
 def save_store(data):
     os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
     tmp = DATA_FILE + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump(data, f)
-    os.rename(tmp, DATA_FILE)
+    fd  = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, DATA_FILE)
+
+
+def counts_snapshot():
+    with _counts_lock:
+        return dict(request_counts)
 
 
 @app.before_request
 def count_request():
-    request_counts[request.path] = request_counts.get(request.path, 0) + 1
+    with _counts_lock:
+        request_counts[request.path] += 1
 
 
 @app.route("/health")
@@ -80,7 +97,7 @@ def stats():
     return jsonify({
         "env":            APP_ENV,
         "uptime_seconds": round(time.time() - start_time, 1),
-        "requests":       request_counts,
+        "requests":       counts_snapshot(),
     })
 
 
@@ -92,7 +109,7 @@ def debug():
     return jsonify({
         "env":            APP_ENV,
         "store":          store,
-        "request_counts": request_counts,
+        "request_counts": counts_snapshot(),
         "uptime_seconds": round(time.time() - start_time, 1),
         "pid":            os.getpid(),
     })
@@ -4,17 +4,21 @@ Only activated when Compose is started with --profile dev.
 """
 import os
 import time
-import json
-import urllib.request
+import orjson
+import urllib3
 
 API_URL       = os.environ.get("API_URL", "http://api:5000")
 POLL_INTERVAL = int(os.environ.get("POLL_INTERVAL", 3))
 
+HTTP = urllib3.PoolManager(num_pools=4, maxsize=16, retries=urllib3.Retry(total=1))
+
 
 def get(path):
     try:
-        with urllib.request.urlopen(f"{API_URL}{path}", timeout=5) as r:
-            return json.loads(r.read())
+        r = HTTP.request("GET", f"{API_URL}{path}", timeout=5)
+        if r.status >= 400:
+            return {"error": f"HTTP Error {r.status}: {r.reason}"}
+        return orjson.loads(r.data)
     except Exception as e:
         return {"error": str(e)}
 
@@ -0,0 +1,22 @@
+"""
+orjson-backed JSON provider for Flask.
+
+Installed with ``app.json = OrjsonProvider(app)`` so every existing
+``jsonify`` call serializes, and every ``request.get_json`` parses,
+through orjson instead of stdlib json.
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
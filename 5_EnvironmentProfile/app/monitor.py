@@ -5,21 +5,26 @@ Only activated when Compose is started with --profile prod.
 import os
 import time
 import json
-import urllib.request
-import urllib.error
+import orjson
+import urllib3
 
 API_URL       = os.environ.get("API_URL", "http://api:5000")
 POLL_INTERVAL = int(os.environ.get("POLL_INTERVAL", 5))
 
+HTTP = urllib3.PoolManager(num_pools=4, maxsize=16, retries=urllib3.Retry(total=1))
+
 
 def get(path):
     try:
-        with urllib.request.urlopen(f"{API_URL}{path}", timeout=5) as r:
-            return json.loads(r.read()), r.status
-    except urllib.error.HTTPError as e:
-        return {"error": str(e)}, e.code
+        r = HTTP.request("GET", f"{API_URL}{path}", timeout=5)
     except Exception as e:
         return {"error": str(e)}, 0
+    if r.status >= 400:
+        return {"error": f"HTTP Error {r.status}: {r.reason}"}, r.status
+    try:
+        return orjson.loads(r.data), r.status
+    except orjson.JSONDecodeError as e:
+        return {"error": str(e)}, r.status
 
 
 def log_ok(msg):
@@ -4,29 +4,34 @@ Behaviour adapts to the env reported by /health (dev vs non-dev /debug rule).
 """
 import os
 import sys
-import json
-import urllib.request
-import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import urllib3
 
 API_URL = os.environ.get("API_URL", "http://api:5000")
 
+HTTP = urllib3.PoolManager(num_pools=4, maxsize=16, retries=urllib3.Retry(total=1))
+
 PASS = 0
 FAIL = 0
 
 
 def get(path):
-    with urllib.request.urlopen(f"{API_URL}{path}", timeout=10) as r:
-        return json.loads(r.read()), r.status
+    r = HTTP.request("GET", f"{API_URL}{path}", timeout=10)
+    return orjson.loads(r.data), r.status
 
 
 def post(path, data):
-    body = json.dumps(data).encode()
-    req  = urllib.request.Request(
-        f"{API_URL}{path}", data=body,
-        headers={"Content-Type": "application/json"},
+    r = HTTP.request(
+        "POST", f"{API_URL}{path}", body=orjson.dumps(data),
+        headers={"Content-Type": "application/json"}, timeout=10,
     )
-    with urllib.request.urlopen(req, timeout=10) as r:
-        return json.loads(r.read()), r.status
+    return orjson.loads(r.data), r.status
+
+
+def store_and_fetch():
+    """POST a value, then read it back — the only dependent pair of calls."""
+    return post("/data", {"key": "tester-key", "value": "hello-42"}), get("/data/tester-key")
 
 
 def check(name, condition, detail=""):
@@ -50,40 +55,42 @@ check("health.status == ok",       data.get("status") == "ok")
 api_env = data.get("env", "unknown")
 print(f"[TESTER] api reports APP_ENV={api_env}", flush=True)
 
+# the remaining calls do not depend on each other: issue them together,
+# then check the results in order
+with ThreadPoolExecutor(max_workers=4) as pool:
+    stored  = pool.submit(store_and_fetch)
+    missing = pool.submit(get, "/data/no-such-key-xyz")
+    stats   = pool.submit(get, "/stats")
+    debug   = pool.submit(get, "/debug")
+posted, fetched = stored.result()
+
 # ── 2: store a value ───────────────────────────────────────────────────────
-data, status = post("/data", {"key": "tester-key", "value": "hello-42"})
+data, status = posted
 check("POST /data returns 200",    status == 200)
 check("POST /data ok=True",        data.get("ok") is True)
 
 # ── 3: retrieve the value ──────────────────────────────────────────────────
-data, status = get("/data/tester-key")
+data, status = fetched
 check("GET /data/<key> returns 200",     status == 200)
 check("GET /data/<key> correct value",   data.get("value") == "hello-42")
 
 # ── 4: 404 for unknown key ─────────────────────────────────────────────────
-try:
-    get("/data/no-such-key-xyz")
-    check("GET /data/missing returns 404", False, "expected HTTPError")
-except urllib.error.HTTPError as e:
-    check("GET /data/missing returns 404", e.code == 404)
+data, status = missing.result()
+check("GET /data/missing returns 404", status == 404)
 
 # ── 5: stats ───────────────────────────────────────────────────────────────
-data, status = get("/stats")
+data, status = stats.result()
 check("GET /stats returns 200",          status == 200)
 check("stats has uptime_seconds",        "uptime_seconds" in data)
 check("stats has requests map",          isinstance(data.get("requests"), dict))
 
 # ── 6: /debug access control ──────────────────────────────────────────────
+data, status = debug.result()
 if api_env == "development":
-    data, status = get("/debug")
     check("GET /debug available in dev",  status == 200)
     check("debug shows store dict",       isinstance(data.get("store"), dict))
 else:
-    try:
-        get("/debug")
-        check("GET /debug blocked in non-dev", False, "expected 403")
-    except urllib.error.HTTPError as e:
-        check("GET /debug blocked in non-dev", e.code == 403)
+    check("GET /debug blocked in non-dev", status == 403)
 
 # ── summary ────────────────────────────────────────────────────────────────
 total = PASS + FAIL
@@ -6,10 +6,13 @@ Demonstrates that persisted state is accessible even when the service
 container is completely stopped or removed.
 """
 
-import json
+import os
 import sys
+from collections import deque
 from pathlib import Path
 
+import orjson
+
 DATA_DIR     = Path("/data")
 SESSIONS_DIR = DATA_DIR / "sessions"
 EVENTS_FILE  = DATA_DIR / "events.jsonl"
@@ -33,19 +36,23 @@ def main():
 
     section("PERSISTENT STATS")
     if STATS_FILE.exists():
-        stats = json.loads(STATS_FILE.read_text())
+        stats = orjson.loads(STATS_FILE.read_bytes())
         for k, v in stats.items():
             print(f"  {k:<28} {v}")
     else:
         print("  (no stats yet)")
 
     section("SESSIONS")
-    sessions = sorted(SESSIONS_DIR.glob("*.json")) if SESSIONS_DIR.exists() else []
+    sessions = []
+    if SESSIONS_DIR.exists():
+        with os.scandir(SESSIONS_DIR) as it:
+            sessions = sorted(e.path for e in it if e.name.endswith(".json"))
     if sessions:
         print(f"  {'ID':<36}  {'NAME':<20}  {'ACCESSES':>8}  CREATED")
         hr("·")
         for p in sessions:
-            s = json.loads(p.read_text())
+            with open(p, "rb") as f:
+                s = orjson.loads(f.read())
             print(f"  {s['id']:<36}  {s.get('name',''):<20}"
                   f"  {s.get('access_count', 0):>8}  {s.get('created_at', '')}")
     else:
@@ -54,15 +61,21 @@ def main():
 
     section("RECENT EVENTS  (last 10)")
     if EVENTS_FILE.exists():
-        lines = [l for l in EVENTS_FILE.read_text().splitlines() if l.strip()]
-        for line in lines[-10:]:
-            e      = json.loads(line)
+        recent = deque(maxlen=10)
+        total  = 0
+        with open(EVENTS_FILE, "rb") as f:
+            for line in f:
+                if line.strip():
+                    recent.append(line)
+                    total += 1
+        for line in recent:
+            e      = orjson.loads(line)
             cid    = e.get("container", "")[:8]
             extras = {k: v for k, v in e.items()
                       if k not in ("ts", "time", "event", "container")}
             suffix = f"  {extras}" if extras else ""
             print(f"  {e['time']}  [{cid}]  {e['event']}{suffix}")
-        print(f"\n  Total events: {len(lines)}")
+        print(f"\n  Total events: {total}")
     else:
         print("  (no events yet)")
 
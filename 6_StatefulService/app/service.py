@@ -7,15 +7,20 @@ Demonstrates persistent application state: all durable data lives in /data
 or crash without losing sessions, the event log, or lifecycle counters.
 """
 
-import json
+import atexit
 import os
+import signal
 import sys
+import threading
 import time
 import uuid
 from pathlib import Path
 
+import orjson
 from flask import Flask, abort, jsonify, request
 
+from json_provider import OrjsonProvider
+
 PORT      = int(os.environ.get("PORT", 8080))
 DATA_DIR  = Path(os.environ.get("DATA_DIR", "/data"))
 
@@ -23,36 +28,129 @@ SESSIONS_DIR = DATA_DIR / "sessions"
 EVENTS_FILE  = DATA_DIR / "events.jsonl"
 STATS_FILE   = DATA_DIR / "stats.json"
 
+EVENTS_TAIL_BYTES  = 64 * 1024   # first read window for /events
+EVENTS_BUFFER      = 64 * 1024   # append buffer for EVENTS_FILE
+EVENTS_FLUSH_EVERY = 32          # requests between buffer flushes
+STATS_DELAY        = 5.0         # seconds; counter bumps in this window share one write
+
 # ── In-memory identity (new value every container start) ──────────────────────
 CONTAINER_ID  = str(uuid.uuid4())[:8]
 START_TIME    = time.time()
 req_count     = 0   # requests served this container instance
+total_events  = 0   # lines in EVENTS_FILE, counted once at boot
+
+# Write-through cache of SESSIONS_DIR, loaded once at boot; the files stay
+# the durable copy.
+SESSIONS: dict[str, dict] = {}
+_sessions_body: bytes | None = None   # cached GET /sessions response, dropped on every mutation
+
+# Lifecycle counters, loaded once at boot and written back lazily.
+_stats: dict = {}
+_stats_dirty = False
+
+# gunicorn runs one process with several threads; this guards SESSIONS, the
+# events handle and the counters above.
+_lock = threading.RLock()
 
 # ── Volume helpers ─────────────────────────────────────────────────────────────
 
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write data to path's .tmp sibling, fdatasync it, then rename over path."""
+    tmp = path.with_suffix(".tmp")
+    fd  = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+        os.fdatasync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
 def _load_stats() -> dict:
     if STATS_FILE.exists():
-        return json.loads(STATS_FILE.read_text())
+        return orjson.loads(STATS_FILE.read_bytes())
     return {"startup_count": 0, "crash_count": 0,
             "total_sessions": 0, "total_requests": 0}
 
 
 def _save_stats(s: dict) -> None:
-    tmp = STATS_FILE.with_suffix(".tmp")
-    tmp.write_text(json.dumps(s, indent=2))
-    tmp.rename(STATS_FILE)
+    s["total_events"] = total_events
+    _atomic_write_bytes(STATS_FILE, orjson.dumps(s))
+
+
+def _bump_stat(key: str) -> None:
+    """Increment a counter and schedule a stats.json write (caller holds _lock)."""
+    global _stats_dirty
+    _stats[key] = _stats.get(key, 0) + 1
+    if not _stats_dirty:
+        _stats_dirty = True
+        timer = threading.Timer(STATS_DELAY, _flush_stats)
+        timer.daemon = True
+        timer.start()
+
+
+def _flush_stats() -> None:
+    global _stats_dirty
+    with _lock:
+        if _stats_dirty:
+            _save_stats(_stats)
+            _stats_dirty = False
+
+
+_utc_cache = (-1, "")   # (epoch second, its formatted string), swapped as one tuple
+
+
+def _utc_now(ts: float | None = None) -> str:
+    """ISO-8601 UTC timestamp; strftime runs at most once per second."""
+    global _utc_cache
+    sec = int(time.time() if ts is None else ts)
+    cached_sec, text = _utc_cache
+    if sec != cached_sec:
+        text = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec))
+        _utc_cache = (sec, text)
+    return text
 
 
 def _log_event(kind: str, **extra) -> None:
+    global total_events
+    ts    = time.time()
     entry = {
-        "ts":        time.time(),
-        "time":      time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "ts":        ts,
+        "time":      _utc_now(ts),
         "event":     kind,
         "container": CONTAINER_ID,
         **extra,
     }
-    with open(EVENTS_FILE, "a") as f:
-        f.write(json.dumps(entry) + "\n")
+    line = orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+    with _lock:
+        _EVENTS_FH.write(line)
+        total_events += 1
+
+
+def _count_events() -> int:
+    if not EVENTS_FILE.exists():
+        return 0
+    with open(EVENTS_FILE, "rb") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def _tail_events(n: int) -> list[bytes]:
+    """Return the last n non-empty lines of EVENTS_FILE, reading only the end."""
+    if n <= 0:
+        return []
+    with open(EVENTS_FILE, "rb") as f:
+        size   = os.fstat(f.fileno()).st_size
+        window = EVENTS_TAIL_BYTES
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            lines = f.read().splitlines()
+            if start > 0:
+                lines = lines[1:]  # first line is (probably) cut in half
+            lines = [l for l in lines if l.strip()]
+            if len(lines) >= n or start == 0:
+                return lines[-n:]
+            window *= 2
 
 
 def _session_path(sid: str) -> Path:
@@ -60,38 +158,62 @@ def _session_path(sid: str) -> Path:
 
 
 def _load_session(sid: str) -> dict:
-    p = _session_path(sid)
-    if not p.exists():
+    sess = SESSIONS.get(sid)
+    if sess is None:
         abort(404, description=f"Session {sid} not found")
-    return json.loads(p.read_text())
+    return sess
 
 
 def _save_session(sess: dict) -> None:
-    p   = _session_path(sess["id"])
-    tmp = p.with_suffix(".tmp")
-    tmp.write_text(json.dumps(sess, indent=2))
-    tmp.rename(p)
+    global _sessions_body
+    data = orjson.dumps(sess)
+    with _lock:
+        _atomic_write_bytes(_session_path(sess["id"]), data)
+        SESSIONS[sess["id"]] = sess
+        _sessions_body = None
 
 
 # ── Bootstrap ─────────────────────────────────────────────────────────────────
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 SESSIONS_DIR.mkdir(exist_ok=True)
 
-_stats = _load_stats()
+with os.scandir(SESSIONS_DIR) as _it:
+    _names = sorted(e.name for e in _it if e.name.endswith(".json"))
+for _name in _names:
+    with open(SESSIONS_DIR / _name, "rb") as _f:
+        _sess = orjson.loads(_f.read())
+    SESSIONS[_sess["id"]] = _sess
+
+total_events = _count_events()
+_EVENTS_FH   = open(EVENTS_FILE, "ab", buffering=EVENTS_BUFFER)
+atexit.register(_EVENTS_FH.close)
+atexit.register(_flush_stats)
+
+_stats.update(_load_stats())
 _stats["startup_count"] = _stats.get("startup_count", 0) + 1
 _save_stats(_stats)
 _log_event("startup",
            startup_count=_stats["startup_count"],
            crash_count=_stats["crash_count"])
+_EVENTS_FH.flush()
 
 # ── Flask app ─────────────────────────────────────────────────────────────────
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 
 @app.before_request
 def _count():
     global req_count
-    req_count += 1
+    with _lock:
+        req_count += 1
+
+
+@app.teardown_appcontext
+def _flush_events(exc):
+    if req_count % EVENTS_FLUSH_EVERY == 0:
+        with _lock:
+            _EVENTS_FH.flush()
 
 
 # ── Routes ────────────────────────────────────────────────────────────────────
@@ -105,8 +227,8 @@ def health():
 
 @app.get("/state")
 def state():
-    s        = _load_stats()
-    sessions = list(SESSIONS_DIR.glob("*.json"))
+    with _lock:
+        s = dict(_stats)
     return jsonify(
         container_id=CONTAINER_ID,
         uptime_seconds=round(time.time() - START_TIME, 1),
@@ -116,7 +238,7 @@ def state():
         crash_count=s["crash_count"],
         total_sessions=s["total_sessions"],
         total_requests=s["total_requests"],
-        live_sessions=len(sessions),
+        live_sessions=len(SESSIONS),
     )
 
 
@@ -124,7 +246,7 @@ def state():
 def create_session():
     body = request.get_json(silent=True) or {}
     sid  = str(uuid.uuid4())
-    now  = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    now  = _utc_now()
     sess = {
         "id":           sid,
         "name":         body.get("name", "unnamed"),
@@ -135,17 +257,20 @@ def create_session():
     }
     _save_session(sess)
     _log_event("session_created", session_id=sid, name=sess["name"])
-    s = _load_stats()
-    s["total_sessions"] = s.get("total_sessions", 0) + 1
-    _save_stats(s)
+    with _lock:
+        _bump_stat("total_sessions")
     return jsonify(sess), 201
 
 
 @app.get("/sessions")
 def list_sessions():
-    sessions = [json.loads(p.read_text())
-                for p in sorted(SESSIONS_DIR.glob("*.json"))]
-    return jsonify(sessions=sessions, count=len(sessions))
+    global _sessions_body
+    with _lock:
+        if _sessions_body is None:
+            _sessions_body = orjson.dumps({"sessions": list(SESSIONS.values()),
+                                           "count": len(SESSIONS)})
+        body = _sessions_body
+    return app.response_class(body, mimetype="application/json")
 
 
 @app.get("/sessions/<sid>")
@@ -155,23 +280,28 @@ def get_session(sid):
 
 @app.put("/sessions/<sid>")
 def update_session(sid):
-    sess = _load_session(sid)
     body = request.get_json(silent=True) or {}
-    if "name" in body:
-        sess["name"] = body["name"]
-    if "data" in body:
-        sess["data"] = body["data"]
-    sess["last_active"]  = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-    sess["access_count"] = sess.get("access_count", 0) + 1
-    _save_session(sess)
+    with _lock:
+        sess = _load_session(sid)
+        if "name" in body:
+            sess["name"] = body["name"]
+        if "data" in body:
+            sess["data"] = body["data"]
+        sess["last_active"]  = _utc_now()
+        sess["access_count"] = sess.get("access_count", 0) + 1
+        _save_session(sess)
     _log_event("session_updated", session_id=sid)
     return jsonify(sess)
 
 
 @app.delete("/sessions/<sid>")
 def delete_session(sid):
-    _load_session(sid)   # raises 404 if missing
-    _session_path(sid).unlink()
+    global _sessions_body
+    with _lock:
+        _load_session(sid)   # raises 404 if missing
+        _session_path(sid).unlink()
+        del SESSIONS[sid]
+        _sessions_body = None
     _log_event("session_deleted", session_id=sid)
     return jsonify(status="deleted", id=sid)
 
@@ -180,25 +310,31 @@ def delete_session(sid):
 def list_events():
     if not EVENTS_FILE.exists():
         return jsonify(events=[], count=0)
-    events = [json.loads(line)
-              for line in EVENTS_FILE.read_text().splitlines()
-              if line.strip()]
+    with _lock:
+        _EVENTS_FH.flush()   # include events still sitting in the buffer
     limit  = int(request.args.get("limit", 50))
-    return jsonify(events=events[-limit:], count=len(events))
+    events = [orjson.loads(line) for line in _tail_events(limit)]
+    return jsonify(events=events, count=total_events)
 
 
 @app.post("/crash")
 def crash():
     """Simulate a crash — increments crash_count then force-exits."""
-    s = _load_stats()
-    s["crash_count"] = s.get("crash_count", 0) + 1
-    _save_stats(s)
-    _log_event("crash_triggered", crash_count=s["crash_count"])
+    with _lock:
+        _bump_stat("crash_count")
+        _flush_stats()   # the timer would never fire after os._exit
+        _log_event("crash_triggered", crash_count=_stats["crash_count"])
+        _EVENTS_FH.flush()
+        os.fsync(_EVENTS_FH.fileno())
     sys.stdout.flush()
     os._exit(1)   # bypass Python cleanup to simulate hard crash
 
 
 # ── Entry ─────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
+    # Only for a local `python service.py` run: compose starts the app under
+    # gunicorn, which handles SIGTERM itself. Without this, SIGTERM (or PID 1
+    # in a bare container ignoring it) would skip the atexit event flush.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
     print(f"[service] container={CONTAINER_ID} port={PORT}", flush=True)
     app.run(host="0.0.0.0", port=PORT)
@@ -0,0 +1,24 @@
+"""
+JSON helpers: orjson when it is installed, stdlib json otherwise.
+
+loads() accepts str or bytes; dumps() always returns bytes, so callers
+write files in binary mode either way.
+"""
+
+try:
+    import orjson
+
+    JSONDecodeError = orjson.JSONDecodeError
+    loads = orjson.loads
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+except ImportError:  # plain python:3.11-slim without the image's extras
+    import json
+
+    JSONDecodeError = json.JSONDecodeError
+    loads = json.loads
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None).encode()
@@ -0,0 +1,11 @@
+"""Schema-version marker shared by the tasks that check it."""
+import os
+
+
+def read_schema(path: str) -> str:
+    """Return the version string in `path`; the marker is a few bytes at most."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 64).strip().decode()
+    finally:
+        os.close(fd)
@@ -2,8 +2,11 @@
 """Analyze task: compute statistics and write report.json to the shared volume."""
 import collections
 import datetime
-import json
 import os
+from operator import itemgetter
+
+from _json_compat import dumps, loads
+from _schema import read_schema
 
 DATA_DIR = os.environ.get("DATA_DIR", "/data")
 
@@ -17,14 +20,14 @@ def main():
         print("[analyze] No records.json found — run seed first")
         raise SystemExit(1)
 
-    with open(records_file) as f:
-        records = json.load(f)
+    with open(records_file, "rb") as f:
+        records = loads(f.read())
 
     schema = "unknown"
     if os.path.exists(schema_file):
-        schema = open(schema_file).read().strip()
+        schema = read_schema(schema_file)
 
-    values = [r["value"] for r in records]
+    values = list(map(itemgetter("value"), records))
 
     report = {
         "generated_at": datetime.datetime.utcnow().isoformat() + "Z",
@@ -42,8 +45,8 @@ def main():
         report["by_category"] = dict(cats)
 
     tmp = report_file + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump(report, f, indent=2)
+    with open(tmp, "wb") as f:
+        f.write(dumps(report, indent=True))
     os.rename(tmp, report_file)
 
     vs = report["value_stats"]
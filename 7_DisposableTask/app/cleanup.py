@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Cleanup task: remove records older than CLEANUP_DAYS from the dataset."""
 import datetime
-import json
 import os
 
+from _json_compat import dumps, loads
+
 DATA_DIR = os.environ.get("DATA_DIR", "/data")
 CLEANUP_DAYS = int(os.environ.get("CLEANUP_DAYS", "30"))
 
@@ -15,24 +16,24 @@ def main():
         print("[cleanup] No records.json found — nothing to clean")
         return
 
-    with open(records_file) as f:
-        records = json.load(f)
+    with open(records_file, "rb") as f:
+        records = loads(f.read())
 
     cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=CLEANUP_DAYS)
+    # created_at is naive-UTC isoformat() + "Z", so string order is time order
+    cutoff_str = cutoff.isoformat()
     kept = []
     removed_ids = []
 
     for r in records:
-        ts = r["created_at"].rstrip("Z")
-        created = datetime.datetime.fromisoformat(ts)
-        if created >= cutoff:
+        if r["created_at"].rstrip("Z") >= cutoff_str:
             kept.append(r)
         else:
             removed_ids.append(r["id"])
 
     tmp = records_file + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump(kept, f, indent=2)
+    with open(tmp, "wb") as f:
+        f.write(dumps(kept, indent=True))
     os.rename(tmp, records_file)
 
     print(f"[cleanup] Threshold: {CLEANUP_DAYS} days (before {cutoff.date()})")
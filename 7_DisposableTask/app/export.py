@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Export task: write records.json as export.csv to the shared volume."""
 import csv
-import json
 import os
 
+from _json_compat import loads
+
 DATA_DIR = os.environ.get("DATA_DIR", "/data")
 
 
@@ -15,20 +16,20 @@ def main():
         print("[export] No records.json found — run seed first")
         raise SystemExit(1)
 
-    with open(records_file) as f:
-        records = json.load(f)
+    with open(records_file, "rb") as f:
+        records = loads(f.read())
 
     if not records:
         print("[export] No records to export")
         return
 
-    fieldnames = list(records[0].keys())
+    fieldnames = list(records[0])
 
     tmp = export_file + ".tmp"
     with open(tmp, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(records)
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows([r.get(k, "") for k in fieldnames] for r in records)
     os.rename(tmp, export_file)
 
     print(f"[export] Exported {len(records)} records to export.csv")
@@ -4,9 +4,11 @@
 v1 fields: id, name, value, created_at
 v2 adds:   category (low/medium/high), normalized_value (0.0-1.0)
 """
-import json
 import os
 
+from _json_compat import dumps, loads
+from _schema import read_schema
+
 DATA_DIR = os.environ.get("DATA_DIR", "/data")
 
 
@@ -28,7 +30,7 @@ def main():
 
     schema = "v1"
     if os.path.exists(schema_file):
-        schema = open(schema_file).read().strip()
+        schema = read_schema(schema_file)
 
     if schema == "v2":
         print("[migrate] Already at schema v2 — nothing to do")
@@ -38,8 +40,8 @@ def main():
         print(f"[migrate] Unknown schema version '{schema}' — cannot migrate")
         raise SystemExit(1)
 
-    with open(records_file) as f:
-        records = json.load(f)
+    with open(records_file, "rb") as f:
+        records = loads(f.read())
 
     migrated = 0
     for r in records:
@@ -49,8 +51,8 @@ def main():
             migrated += 1
 
     tmp = records_file + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump(records, f, indent=2)
+    with open(tmp, "wb") as f:
+        f.write(dumps(records, indent=True))
     os.rename(tmp, records_file)
 
     with open(schema_file, "w") as f:
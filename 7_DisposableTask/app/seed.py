@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 """Seed task: create initial dataset (schema v1) on the shared volume."""
 import datetime
-import json
 import os
 import random
 
+from _json_compat import dumps
+
 DATA_DIR = os.environ.get("DATA_DIR", "/data")
 RECORDS_COUNT = int(os.environ.get("RECORDS_COUNT", "20"))
 
@@ -36,8 +37,8 @@ def main():
         })
 
     tmp = records_file + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump(records, f, indent=2)
+    with open(tmp, "wb") as f:
+        f.write(dumps(records, indent=True))
     os.rename(tmp, records_file)
 
     with open(schema_file, "w") as f:
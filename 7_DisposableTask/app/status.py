@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 """Status task: inspect the current state of the shared data volume."""
-import json
 import os
 
+from _json_compat import loads
+from _schema import read_schema
+
 DATA_DIR = os.environ.get("DATA_DIR", "/data")
 
 
+def _read_json(path: str):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
 def main():
     print("=== Volume Status ===")
     if not os.path.exists(DATA_DIR):
@@ -21,11 +28,11 @@ def main():
 
     schema_file = os.path.join(DATA_DIR, "schema_version")
     if os.path.exists(schema_file):
-        print(f"Schema: {open(schema_file).read().strip()}")
+        print(f"Schema: {read_schema(schema_file)}")
 
     records_file = os.path.join(DATA_DIR, "records.json")
     if os.path.exists(records_file):
-        records = json.load(open(records_file))
+        records = _read_json(records_file)
         print(f"Records: {len(records)}")
         if records and "category" in records[0]:
             from collections import Counter
@@ -35,15 +42,17 @@ def main():
 
     report_file = os.path.join(DATA_DIR, "report.json")
     if os.path.exists(report_file):
-        r = json.load(open(report_file))
+        r = _read_json(report_file)
         vs = r["value_stats"]
         print(f"Report: {r['total_records']} records | avg={vs['avg']} min={vs['min']} max={vs['max']}")
 
     export_file = os.path.join(DATA_DIR, "export.csv")
     if os.path.exists(export_file):
-        lines = open(export_file).readlines()
-        headers = lines[0].strip() if lines else "?"
-        print(f"Export: {max(0, len(lines) - 1)} rows | headers: {headers}")
+        with open(export_file, "rb") as f:
+            header = f.readline()
+            rows = sum(1 for _ in f)
+        headers = header.strip().decode() if header else "?"
+        print(f"Export: {rows} rows | headers: {headers}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+"""
+Timestamp helpers shared by the app's log lines and the scraper's snapshots.
+"""
+
+import time
+
+_ts_cache = (0, "")  # (epoch second, "YYYY-MM-DDTHH:MM:SS") last formatted
+
+
+def utcnow_iso() -> str:
+    """Current UTC time as "YYYY-MM-DDTHH:MM:SS.ffffff+00:00".
+
+    Always six fractional digits (microseconds truncated, not rounded), so
+    datetime.fromisoformat() parses it. The date/time prefix is formatted at
+    most once per second.
+    """
+    global _ts_cache
+    t = time.time()
+    sec = int(t)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        tm = time.gmtime(sec)
+        prefix = "%04d-%02d-%02dT%02d:%02d:%02d" % tm[:6]
+        _ts_cache = (sec, prefix)
+    return "%s.%06d+00:00" % (prefix, (t - sec) * 1e6)
@@ -11,13 +11,14 @@ Combines BOTH observation channels:
 Run with:  docker compose --profile debug run --rm debugger
 """
 
-import json
 import os
 import sys
 from collections import Counter
 from datetime import datetime, timezone
-from urllib.request import urlopen
-from urllib.error import URLError
+from http.client import HTTPConnection, HTTPException
+from urllib.parse import urlsplit
+
+from _json_compat import JSONDecodeError, loads
 
 APP_URL   = os.environ.get("APP_URL", "http://app:8080")
 LOG_PATH  = "/logs/app.log"
@@ -32,31 +33,53 @@ RED   = "\033[31m"
 RESET = "\033[0m"
 SEP   = f"{CYAN}{'─' * 52}{RESET}"
 
+# One connection for every network query; reopened automatically if the app
+# closes it after a response.
+_app = urlsplit(APP_URL)
+CONN = HTTPConnection(_app.hostname, _app.port or 80, timeout=3)
+
+
+def fetch(path: str) -> bytes:
+    try:
+        CONN.request("GET", path)
+        resp = CONN.getresponse()
+        raw  = resp.read()
+    except (OSError, HTTPException):
+        CONN.close()
+        raise
+    if resp.status >= 400:
+        raise HTTPException(f"HTTP Error {resp.status}: {resp.reason}")
+    return raw
+
 
 def http_get(path: str) -> dict | str:
     try:
-        resp = urlopen(f"{APP_URL}{path}", timeout=3)
-        raw = resp.read().decode()
+        raw = fetch(path)
         try:
-            return json.loads(raw)
-        except json.JSONDecodeError:
-            return raw
-    except URLError as e:
+            return loads(raw)
+        except JSONDecodeError:
+            return raw.decode()
+    except (OSError, HTTPException) as e:
         return {"__error__": str(e)}
 
 
 def read_jsonl(path: str) -> list[dict]:
     if not os.path.exists(path):
         return []
+    with open(path, "rb") as f:
+        lines = [l for l in f.read().split(b"\n") if l.strip()]
+    try:
+        # one parse for the whole file as a JSON array
+        return loads(b"[" + b",".join(lines) + b"]")
+    except JSONDecodeError:
+        pass
+    # a torn or malformed line somewhere: parse line by line and skip it
     entries = []
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                try:
-                    entries.append(json.loads(line))
-                except json.JSONDecodeError:
-                    pass
+    for line in lines:
+        try:
+            entries.append(loads(line))
+        except JSONDecodeError:
+            pass
     return entries
 
 
@@ -89,8 +112,7 @@ def main() -> None:
     # ── 2. Live metrics via network ──────────────────────────────────────────
     section("2. Live Metrics  (via network)")
     try:
-        resp = urlopen(f"{APP_URL}/metrics", timeout=3)
-        raw  = resp.read().decode()
+        raw = fetch("/metrics").decode()
         for line in raw.splitlines():
             if not line.startswith("#") and line.strip():
                 parts = line.split()
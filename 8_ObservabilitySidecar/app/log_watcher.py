@@ -9,12 +9,19 @@ This demonstrates that sidecars can observe purely via shared filesystem
 without any network access to the primary service.
 """
 
-import json
+import ctypes
+import ctypes.util
 import os
+import select
 import time
 
+from _json_compat import JSONDecodeError, loads
+
 LOG_PATH = "/logs/app.log"
 
+IN_MODIFY    = 0x00000002   # <sys/inotify.h>
+IDLE_TIMEOUT = 1.0          # re-check the file at least this often while idle
+
 # ANSI colours
 RED    = "\033[31m"
 GREEN  = "\033[32m"
@@ -31,31 +38,48 @@ LEVEL_COLOUR = {
     "ERROR":   RED,
 }
 
+# Coloured, padded level column, built once per known level
+LEVEL_TOKEN = {lvl: f"{colour}{BOLD}{lvl:<7}{RESET}" for lvl, colour in LEVEL_COLOUR.items()}
+
 
 def format_entry(raw: str) -> str:
     raw = raw.strip()
     if not raw:
         return ""
     try:
-        entry = json.loads(raw)
-    except json.JSONDecodeError:
+        entry = loads(raw)
+    except JSONDecodeError:
         return f"{DIM}{raw}{RESET}"
 
     ts    = entry.get("ts", "")
     ts_s  = ts[11:19] if len(ts) >= 19 else ts   # HH:MM:SS portion
     level = entry.get("level", "INFO")
+    token = LEVEL_TOKEN.get(level) or f"{BOLD}{level:<7}{RESET}"
     msg   = entry.get("msg", "")
-    color = LEVEL_COLOUR.get(level, "")
 
-    extras = {k: v for k, v in entry.items() if k not in ("ts", "level", "msg")}
-    extras_str = "  " + "  ".join(f"{k}={v}" for k, v in extras.items()) if extras else ""
+    extras_str = "".join(f"  {k}={v}" for k, v in entry.items()
+                         if k != "ts" and k != "level" and k != "msg")
+
+    return f"{DIM}{ts_s}{RESET} {token} {msg}{DIM}{extras_str}{RESET}"
 
-    return (
-        f"{DIM}{ts_s}{RESET} "
-        f"{color}{BOLD}{level:<7}{RESET} "
-        f"{msg}"
-        f"{DIM}{extras_str}{RESET}"
-    )
+
+def inotify_watch(path: str) -> int | None:
+    """Return an inotify fd that becomes readable when path is written, or None.
+
+    Uses libc directly so the image stays dependency-free; callers fall back to
+    polling where inotify is unavailable (non-Linux hosts).
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(path), IN_MODIFY) < 0:
+        os.close(fd)
+        return None
+    return fd
 
 
 def tail_forever(path: str) -> None:
@@ -68,6 +92,7 @@ def tail_forever(path: str) -> None:
         print(f"{DIM}  waiting for {path} ...{RESET}", flush=True)
         time.sleep(1)
 
+    watch = inotify_watch(path)
     with open(path, "r") as f:
         f.seek(0, 2)  # seek to end — only show new entries
         while True:
@@ -76,6 +101,10 @@ def tail_forever(path: str) -> None:
                 formatted = format_entry(line)
                 if formatted:
                     print(formatted, flush=True)
+            elif watch is not None:
+                # sleep in the kernel until the app writes, then drain the events
+                if select.select([watch], [], [], IDLE_TIMEOUT)[0]:
+                    os.read(watch, 4096)
             else:
                 time.sleep(0.1)
 
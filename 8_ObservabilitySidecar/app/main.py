@@ -12,78 +12,195 @@ Writes structured JSONL to /logs/app.log so sidecars can observe without
 any code changes to this service.
 """
 
-import json
+import atexit
 import os
+import queue
+import selectors
+import signal
+import socket
+import sys
 import time
 import threading
-from datetime import datetime, timezone
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from socketserver import ThreadingMixIn
-from urllib.parse import urlparse
+
+from _json_compat import JSONDecodeError, dumps, loads
+from _timestamps import utcnow_iso
 
 LOG_PATH = "/logs/app.log"
 PORT = int(os.environ.get("PORT", 8080))
+LOG_BUFFER = 64 * 1024
+STDOUT_FLUSH_INTERVAL = 0.1  # seconds; how far `docker logs` may lag app.log
+HANDLER_STACK = 512 * 1024  # handlers are shallow; the 8 MiB default is wasted
+HANDLER_THREADS = int(os.environ.get("HANDLER_THREADS", 32))
+MAX_PENDING = HANDLER_THREADS * 16  # readable connections queued for a worker
+MAX_IDLE = 4096  # open connections waiting for their next request
+# /process stands in for an I/O-bound call (a DB or downstream API), not CPU
+# work: the sleep releases the GIL, so up to HANDLER_THREADS calls overlap.
+WORK_DELAY = float(os.environ.get("WORK_DELAY", 0.05))
+
+# Handler threads bump these without a lock. That relies on the GIL build of
+# CPython 3.11 the Dockerfile pins (python:3.11-slim), which only switches
+# threads at calls and backward jumps, so `global x; x += 1` on an int is never
+# interrupted halfway through. It is not a language guarantee: a free-threaded
+# (3.13+ no-GIL) interpreter would lose updates, so revisit this if the base
+# image changes. Plain globals skip the dict subscript per bump.
+_requests_total = 0
+_requests_ok = 0
+_requests_err = 0
+_process_total = 0
+_process_ok = 0
+_process_err = 0
+_start_time = time.time()
+
+# Static HELP/TYPE lines, built once; _metrics only fills in the values
+METRICS_TEMPLATE = "\n".join([
+    "# HELP requests_total Total HTTP requests received",
+    "# TYPE requests_total counter",
+    "requests_total %d",
+    "# HELP requests_ok Successful HTTP responses",
+    "# TYPE requests_ok counter",
+    "requests_ok %d",
+    "# HELP requests_err Error HTTP responses",
+    "# TYPE requests_err counter",
+    "requests_err %d",
+    "# HELP process_total Total /process calls",
+    "# TYPE process_total counter",
+    "process_total %d",
+    "# HELP process_ok Successful /process calls",
+    "# TYPE process_ok counter",
+    "process_ok %d",
+    "# HELP process_err Failed /process calls",
+    "# TYPE process_err counter",
+    "process_err %d",
+    "# HELP uptime_seconds Application uptime in seconds",
+    "# TYPE uptime_seconds gauge",
+    "uptime_seconds %.1f",
+    "",
+]).encode()
+
+HEALTH_TEMPLATE = b'{"status":"ok","uptime_s":%.1f}'
+
+os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+_log_fh = open(LOG_PATH, "ab", buffering=LOG_BUFFER)
+
+# Serialized log lines waiting for the writer thread; handlers never touch disk
+LOG_Q = queue.SimpleQueue()
+
+
+def _write_batch(batch):
+    data = b"".join(batch)
+    _log_fh.write(data)
+    _log_fh.flush()
+    sys.stdout.buffer.write(data)
+
 
-_lock = threading.Lock()
-_counters = {
-    "requests_total": 0,
-    "requests_ok": 0,
-    "requests_err": 0,
-    "process_total": 0,
-    "process_ok": 0,
-    "process_err": 0,
-    "start_time": time.time(),
-}
+def _log_writer():
+    """Drain LOG_Q forever, writing whatever has piled up with one write each.
+
+    app.log is flushed per batch for the sidecars; stdout is flushed at most
+    every STDOUT_FLUSH_INTERVAL so the container log driver sees fewer writes.
+    """
+    stdout = sys.stdout.buffer
+    flush_at = None  # when buffered stdout output is due, if there is any
+    while True:
+        try:
+            if flush_at is None:
+                batch = [LOG_Q.get()]
+            else:
+                batch = [LOG_Q.get(timeout=max(flush_at - time.monotonic(), 0))]
+        except queue.Empty:
+            stdout.flush()
+            flush_at = None
+            continue
+        while True:
+            try:
+                batch.append(LOG_Q.get_nowait())
+            except queue.Empty:
+                break
+        _write_batch(batch)
+        now = time.monotonic()
+        if flush_at is None:
+            flush_at = now + STDOUT_FLUSH_INTERVAL
+        elif now >= flush_at:  # steady logging never lets the get() time out
+            stdout.flush()
+            flush_at = None
+
+
+def _flush_pending():
+    batch = []
+    while True:
+        try:
+            batch.append(LOG_Q.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _write_batch(batch)
+    sys.stdout.buffer.flush()
+
+
+atexit.register(_flush_pending)
 
 
 def log(level, msg, **extra):
     entry = {
-        "ts": datetime.now(timezone.utc).isoformat(),
+        "ts": utcnow_iso(),
         "level": level,
         "msg": msg,
         **extra,
     }
-    os.makedirs("/logs", exist_ok=True)
-    with open(LOG_PATH, "a") as f:
-        f.write(json.dumps(entry) + "\n")
-    print(json.dumps(entry), flush=True)
+    LOG_Q.put(dumps(entry) + b"\n")
 
 
 class Handler(BaseHTTPRequestHandler):
+    # Keep connections open so the scraper's polls reuse one socket; every
+    # response sets Content-Length. Idle connections are dropped after `timeout`.
+    protocol_version = "HTTP/1.1"
+    timeout = 30
+    # Headers and body go out as two writes; with Nagle on, the body waits for
+    # the client's delayed ACK (~40 ms) on a kept-alive connection.
+    disable_nagle_algorithm = True
+
+    def __init__(self, request, client_address, server):
+        # PooledHTTPServer calls handle_one_request() each time the connection
+        # is readable, so only open the socket streams here.
+        self.request = request
+        self.client_address = client_address
+        self.server = server
+        self.close_connection = True
+        self.setup()
+
     def log_message(self, format, *args):
         pass  # suppress default HTTP server noise
 
     def do_GET(self):
-        with _lock:
-            _counters["requests_total"] += 1
+        global _requests_total, _requests_ok, _requests_err
+        _requests_total += 1
 
-        path = urlparse(self.path).path
+        path = self.path.partition("?")[0]
 
         if path == "/health":
-            with _lock:
-                uptime = round(time.time() - _counters["start_time"], 1)
-                _counters["requests_ok"] += 1
+            uptime = round(time.time() - _start_time, 1)
+            _requests_ok += 1
             log("INFO", "health check", uptime_s=uptime)
-            self._json(200, {"status": "ok", "uptime_s": uptime})
+            self._raw(200, "application/json", HEALTH_TEMPLATE % uptime)
 
         elif path == "/metrics":
             self._metrics()
 
         else:
-            with _lock:
-                _counters["requests_err"] += 1
+            _requests_err += 1
             self._json(404, {"error": "not found", "path": path})
 
     def do_POST(self):
-        with _lock:
-            _counters["requests_total"] += 1
+        global _requests_total, _requests_err
+        _requests_total += 1
 
-        path = urlparse(self.path).path
+        path = self.path.partition("?")[0]
         length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(length).decode() if length else "{}"
+        body = self.rfile.read(length) if length else b"{}"
         try:
-            data = json.loads(body)
-        except json.JSONDecodeError:
+            data = loads(body)
+        except JSONDecodeError:
             data = {}
 
         if path == "/process":
@@ -91,91 +208,176 @@ class Handler(BaseHTTPRequestHandler):
         elif path == "/fail":
             self._handle_fail(data)
         else:
-            with _lock:
-                _counters["requests_err"] += 1
+            _requests_err += 1
             self._json(404, {"error": "not found", "path": path})
 
     def _handle_process(self, data):
-        with _lock:
-            _counters["process_total"] += 1
+        global _process_total, _process_ok, _requests_ok
+        _process_total += 1
 
         task = data.get("task", "unnamed-task")
         log("INFO", "processing task", task=task)
 
         t0 = time.time()
-        time.sleep(0.05)  # simulate work
+        time.sleep(WORK_DELAY)  # simulated I/O wait
         result = f"done:{task}:{int(time.time())}"
         elapsed = round(time.time() - t0, 3)
 
-        with _lock:
-            _counters["process_ok"] += 1
-            _counters["requests_ok"] += 1
+        _process_ok += 1
+        _requests_ok += 1
 
         log("INFO", "task complete", task=task, elapsed_s=elapsed, result=result)
         self._json(200, {"result": result, "elapsed_s": elapsed})
 
     def _handle_fail(self, data):
+        global _process_err, _requests_err
         reason = data.get("reason", "simulated-failure")
-        with _lock:
-            _counters["process_err"] += 1
-            _counters["requests_err"] += 1
+        _process_err += 1
+        _requests_err += 1
         log("ERROR", "task failed", reason=reason)
         self._json(500, {"error": reason})
 
     def _metrics(self):
-        with _lock:
-            c = dict(_counters)
-        uptime = round(time.time() - c["start_time"], 1)
-
-        lines = [
-            "# HELP requests_total Total HTTP requests received",
-            "# TYPE requests_total counter",
-            f"requests_total {c['requests_total']}",
-            "# HELP requests_ok Successful HTTP responses",
-            "# TYPE requests_ok counter",
-            f"requests_ok {c['requests_ok']}",
-            "# HELP requests_err Error HTTP responses",
-            "# TYPE requests_err counter",
-            f"requests_err {c['requests_err']}",
-            "# HELP process_total Total /process calls",
-            "# TYPE process_total counter",
-            f"process_total {c['process_total']}",
-            "# HELP process_ok Successful /process calls",
-            "# TYPE process_ok counter",
-            f"process_ok {c['process_ok']}",
-            "# HELP process_err Failed /process calls",
-            "# TYPE process_err counter",
-            f"process_err {c['process_err']}",
-            "# HELP uptime_seconds Application uptime in seconds",
-            "# TYPE uptime_seconds gauge",
-            f"uptime_seconds {uptime}",
-            "",
-        ]
-        body = "\n".join(lines).encode()
-        self.send_response(200)
-        self.send_header("Content-Type", "text/plain; version=0.0.4")
-        self.send_header("Content-Length", len(body))
-        self.end_headers()
-        self.wfile.write(body)
+        # Counters are read one at a time while handlers keep bumping them, so
+        # requests_total may briefly disagree with ok + err by an in-flight
+        # request; scrapes are eventually consistent, which is fine for monitoring.
+        body = METRICS_TEMPLATE % (
+            _requests_total, _requests_ok, _requests_err,
+            _process_total, _process_ok, _process_err,
+            time.time() - _start_time,
+        )
+        self._raw(200, "text/plain; version=0.0.4", body)
         log("INFO", "metrics scraped")
 
     def _json(self, code, data):
-        body = json.dumps(data).encode()
+        self._raw(code, "application/json", dumps(data))
+
+    def _raw(self, code, content_type, body):
         self.send_response(code)
-        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Type", content_type)
         self.send_header("Content-Length", len(body))
         self.end_headers()
         self.wfile.write(body)
 
 
-class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-    """Handle each request in a separate thread."""
-    daemon_threads = True
+class PooledHTTPServer(HTTPServer):
+    """Handle requests on a fixed pool of daemon threads.
+
+    Every connection, new or kept-alive, waits with the idle watcher thread
+    until the client has sent something; only then does a worker take it, serve
+    one request and park it again. Idle or silent clients cost a socket, not a
+    worker, so they cannot lock anyone out. At most MAX_PENDING readable
+    connections wait for a worker and at most MAX_IDLE sit with the watcher;
+    beyond either, connections are closed. The workers are daemons (unlike
+    ThreadPoolExecutor's) so a kept-alive scraper connection cannot hold up
+    shutdown.
+    """
+
+    def __init__(self, server_address, handler_class, workers=HANDLER_THREADS):
+        super().__init__(server_address, handler_class)
+        self._ready = queue.Queue(MAX_PENDING)   # readable handlers for the workers
+        self._parked = queue.SimpleQueue()        # (handler, is_new) for the watcher
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_w.setblocking(False)
+        threading.Thread(target=self._watch_idle, daemon=True).start()
+        for _ in range(workers):
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def process_request(self, request, client_address):
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+            return
+        self._park(handler, True)
+
+    def _park(self, handler, is_new=False):
+        self._parked.put((handler, is_new))
+        try:
+            self._wake_w.send(b"\0")
+        except BlockingIOError:
+            pass  # the watcher has wake-ups pending already
+
+    def _worker(self):
+        while True:
+            handler = self._ready.get()
+            while True:
+                try:
+                    handler.handle_one_request()
+                except Exception:
+                    self.handle_error(handler.request, handler.client_address)
+                    handler.close_connection = True
+                # A pipelined request may already sit in rfile's buffer, where
+                # the selector cannot see it: serve it now.
+                if handler.close_connection or not self._has_buffered_input(handler):
+                    break
+            if handler.close_connection:
+                self._close(handler)
+            else:
+                self._park(handler)
+
+    def _has_buffered_input(self, handler):
+        sock = handler.connection
+        sock.setblocking(False)
+        try:
+            return bool(handler.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            sock.settimeout(handler.timeout)
+
+    def _close(self, handler):
+        try:
+            handler.finish()
+        except OSError:
+            pass
+        self.shutdown_request(handler.request)
+
+    def _watch_idle(self):
+        """Own the selector of waiting connections; only this thread touches it.
+
+        Never blocks on the workers: when _ready is full, a readable connection
+        is closed rather than stalling parking, wake-ups and the idle sweep.
+        """
+        sel = selectors.DefaultSelector()
+        sel.register(self._wake_r, selectors.EVENT_READ)
+        idle_since = {}
+        while True:
+            for key, _ in sel.select(timeout=1.0):
+                if key.fileobj is self._wake_r:
+                    self._wake_r.recv(4096)
+                    continue
+                handler = key.data
+                sel.unregister(handler.connection)
+                del idle_since[handler]
+                try:
+                    self._ready.put_nowait(handler)
+                except queue.Full:
+                    self._close(handler)
+            while True:
+                try:
+                    handler, is_new = self._parked.get_nowait()
+                except queue.Empty:
+                    break
+                if is_new and len(idle_since) >= MAX_IDLE:
+                    self._close(handler)
+                    continue
+                sel.register(handler.connection, selectors.EVENT_READ, handler)
+                idle_since[handler] = time.monotonic()
+            cutoff = time.monotonic() - Handler.timeout
+            for handler in [h for h, t in idle_since.items() if t < cutoff]:
+                sel.unregister(handler.connection)
+                del idle_since[handler]
+                self._close(handler)
 
 
 if __name__ == "__main__":
-    os.makedirs("/logs", exist_ok=True)
+    # PID 1 ignores SIGTERM by default; exit normally so atexit drains the log queue.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    threading.stack_size(HANDLER_STACK)
+    threading.Thread(target=_log_writer, daemon=True).start()
     log("INFO", "app starting", port=PORT)
-    server = ThreadedHTTPServer(("0.0.0.0", PORT), Handler)
+    server = PooledHTTPServer(("0.0.0.0", PORT), Handler)
     log("INFO", "app ready", port=PORT)
     server.serve_forever()
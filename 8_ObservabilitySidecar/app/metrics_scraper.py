@@ -9,12 +9,15 @@ in /logs/metrics.jsonl so the debugger sidecar can read history without
 needing its own network scrape.
 """
 
-import json
 import os
+import re
 import time
-from datetime import datetime, timezone
-from urllib.request import urlopen
-from urllib.error import URLError
+from datetime import datetime
+from http.client import HTTPConnection
+from urllib.parse import urlsplit
+
+from _json_compat import dumps
+from _timestamps import utcnow_iso
 
 APP_URL        = os.environ.get("APP_URL", "http://app:8080")
 SCRAPE_INTERVAL = int(os.environ.get("SCRAPE_INTERVAL", 5))
@@ -28,66 +31,85 @@ YELLOW = "\033[33m"
 RED    = "\033[31m"
 RESET  = "\033[0m"
 
+# One keep-alive connection reused for every scrape
+_app = urlsplit(APP_URL)
+CONN = HTTPConnection(_app.hostname, _app.port or 80, timeout=3)
+
+os.makedirs(os.path.dirname(METRICS_LOG), exist_ok=True)
+# Unbuffered append-only fd: each snapshot is one write(), appended atomically
+_metrics_fd = os.open(METRICS_LOG, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o644)
+
+
+# One sample per line: a metric name, optional {labels}, then the value.
+# Comments and blank lines never match.
+METRIC_LINE = re.compile(
+    rb"^([A-Za-z_:][A-Za-z0-9_:]*(?:\{[^}\n]*\})?)[ \t]+(\S+)[ \t]*$", re.MULTILINE
+)
 
-def parse_prometheus(text: str) -> dict:
-    """Parse Prometheus text exposition format into a flat dict."""
+
+def parse_prometheus(body: bytes) -> dict:
+    """Parse a raw Prometheus text exposition body into a flat dict."""
     metrics = {}
-    for line in text.splitlines():
-        line = line.strip()
-        if line.startswith("#") or not line:
-            continue
-        parts = line.split()
-        if len(parts) == 2:
-            try:
-                metrics[parts[0]] = float(parts[1])
-            except ValueError:
-                pass
+    for name, value in METRIC_LINE.findall(body):
+        try:
+            metrics[name.decode()] = float(value)
+        except ValueError:
+            pass
     return metrics
 
 
 def scrape() -> dict | None:
-    try:
-        resp = urlopen(f"{APP_URL}/metrics", timeout=3)
-        return parse_prometheus(resp.read().decode())
-    except (URLError, Exception):
-        return None
+    for _ in range(2):  # a kept-alive socket may have gone stale: retry once on a fresh one
+        try:
+            CONN.request("GET", "/metrics")
+            resp = CONN.getresponse()
+            body = resp.read()
+        except Exception:
+            CONN.close()
+            continue
+        if resp.status >= 400:
+            return None
+        return parse_prometheus(body)
+    return None
 
 
 def store(metrics: dict) -> None:
-    entry = {"ts": datetime.now(timezone.utc).isoformat(), **metrics}
-    os.makedirs("/logs", exist_ok=True)
-    with open(METRICS_LOG, "a") as f:
-        f.write(json.dumps(entry) + "\n")
+    entry = {"ts": utcnow_iso(), **metrics}
+    os.write(_metrics_fd, dumps(entry) + b"\n")
+
+
+# Built once; display() only fills in the values
+DISPLAY_TEMPLATE = (
+    f"\n{CYAN}{BOLD}── Metrics Scraper [{{now}}] scrape #{{n}} ──{RESET}\n"
+    f"  {BOLD}Uptime          {RESET} {{uptime_seconds:.0f}}s\n"
+    f"  {BOLD}Requests total  {RESET} {{requests_total:.0f}}{{d_requests_total}}\n"
+    f"  {BOLD}Requests OK     {RESET} {GREEN}{{requests_ok:.0f}}{RESET}{{d_requests_ok}}\n"
+    f"  {BOLD}Requests ERR    {RESET} {{err_color}}{{requests_err:.0f}} ({{err_pct:.1f}}%){RESET}{{d_requests_err}}\n"
+    f"  {BOLD}Process OK      {RESET} {{process_ok:.0f}}{{d_process_ok}}\n"
+    f"  {BOLD}Process ERR     {RESET} {{process_err:.0f}}{{d_process_err}}\n"
+    f"  {DIM}stored → /logs/metrics.jsonl{RESET}"
+)
+DISPLAY_KEYS = ("uptime_seconds", "requests_total", "requests_ok", "requests_err",
+                "process_ok", "process_err")
+DELTA_KEYS   = DISPLAY_KEYS[1:]
 
 
 def display(metrics: dict, prev: dict | None, scrape_n: int) -> None:
-    now = datetime.now().strftime("%H:%M:%S")
-
-    def delta(key: str) -> str:
-        if prev and key in prev:
-            d = metrics.get(key, 0) - prev.get(key, 0)
-            return f" {DIM}(+{d:.0f}){RESET}" if d > 0 else ""
-        return ""
-
-    req_total = metrics.get("requests_total", 0)
-    req_ok    = metrics.get("requests_ok", 0)
-    req_err   = metrics.get("requests_err", 0)
-    uptime    = metrics.get("uptime_seconds", 0)
-    proc_ok   = metrics.get("process_ok", 0)
-    proc_err  = metrics.get("process_err", 0)
-
-    err_pct   = (req_err / req_total * 100) if req_total > 0 else 0.0
+    values = {k: metrics.get(k, 0) for k in DISPLAY_KEYS}
+    prev = prev or {}
+    for k in DELTA_KEYS:
+        d = values[k] - prev[k] if k in prev else 0
+        values["d_" + k] = f" {DIM}(+{d:.0f}){RESET}" if d > 0 else ""
+
+    req_total = values["requests_total"]
+    err_pct   = (values["requests_err"] / req_total * 100) if req_total > 0 else 0.0
     err_color = RED if err_pct > 10 else (YELLOW if err_pct > 0 else GREEN)
 
     print(
-        f"\n{CYAN}{BOLD}── Metrics Scraper [{now}] scrape #{scrape_n} ──{RESET}\n"
-        f"  {BOLD}Uptime          {RESET} {uptime:.0f}s\n"
-        f"  {BOLD}Requests total  {RESET} {req_total:.0f}{delta('requests_total')}\n"
-        f"  {BOLD}Requests OK     {RESET} {GREEN}{req_ok:.0f}{RESET}{delta('requests_ok')}\n"
-        f"  {BOLD}Requests ERR    {RESET} {err_color}{req_err:.0f} ({err_pct:.1f}%){RESET}{delta('requests_err')}\n"
-        f"  {BOLD}Process OK      {RESET} {proc_ok:.0f}{delta('process_ok')}\n"
-        f"  {BOLD}Process ERR     {RESET} {proc_err:.0f}{delta('process_err')}\n"
-        f"  {DIM}stored → /logs/metrics.jsonl{RESET}",
+        DISPLAY_TEMPLATE.format(
+            now=datetime.now().strftime("%H:%M:%S"), n=scrape_n,
+            err_pct=err_pct, err_color=err_color, **values,
+        ),
         flush=True,
     )
 